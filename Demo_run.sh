@@ -10,7 +10,7 @@ if [ -f "venv/bin/activate" ]; then
   source venv/bin/activate
 fi
 
-# Run simulator (script prints and writes outputs/results.csv)
+# Run simulator (script prints and writes outputs/results.parquet)
 python src/simulator.py
 
 # Ensure headless plotting works in environments with no display
@@ -19,7 +19,7 @@ export MPLBACKEND=Agg
 # Run visualizer
 python src/visualize.py
 
-echo "Demo finished. Results: outputs/results.csv and outputs/crack_plot.png"
+echo "Demo finished. Results: outputs/results.parquet and outputs/crack_plot.png"
 
 
 
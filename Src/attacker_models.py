@@ -1,5 +1,7 @@
 # src/attacker_models.py
 from dataclasses import dataclass
+from typing import List
+import numpy as np
 
 @dataclass
 class AttackerProfile:
@@ -14,3 +16,14 @@ SKILLED = AttackerProfile('skilled', dictionary_size=10**6, hash_rate=1e6, brute
 STATE = AttackerProfile('state', dictionary_size=10**8, hash_rate=1e9, brute_force_max_attempts=10**12)
 
 ALL_PROFILES = [CASUAL, SKILLED, STATE]
+
+def profiles_soa(profiles: List[AttackerProfile]) -> np.ndarray:
+    """
+    `profiles` as a structure-of-arrays for vectorized code (one contiguous lane
+    per field); the name field is sized to the longest profile name.
+    """
+    width = max((len(p.name) for p in profiles), default=1)
+    return np.array(
+        [(p.name, p.hash_rate, p.brute_force_max_attempts) for p in profiles],
+        dtype=[('name', f'U{width}'), ('hash_rate', 'f8'), ('max_attempts', 'f8')],
+    )
@@ -1,7 +1,15 @@
 # src/data_ingest.py
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
 from pathlib import Path
 
+# read passwords as plain strings: no numeric/NA inference ("007", "null" stay as-is)
+_CONVERT = pv.ConvertOptions(column_types={"password": pa.string()})
+# keep both Arrow string widths Arrow-backed in pandas
+_ARROW_STRINGS = {pa.string(): pd.StringDtype("pyarrow"), pa.large_string(): pd.StringDtype("pyarrow")}
+
 def load_passwords(path: str) -> pd.DataFrame:
     """
     Load passwords from a text or CSV file into a pandas DataFrame.
@@ -12,18 +20,25 @@ def load_passwords(path: str) -> pd.DataFrame:
         raise FileNotFoundError(f"{path} does not exist")
 
     if path_obj.suffix == ".txt":
-        df = pd.read_csv(path, header=None, names=['password'])
+        # one password per line, not CSV: every character is literal. Text mode maps
+        # \r\n / \r to \n and utf-8-sig drops a leading BOM; the split runs in Arrow,
+        # on \n only (str.splitlines also breaks on \x1c-\x1e, \x85, ...)
+        text = path_obj.read_text(encoding="utf-8-sig")
+        lines = pc.split_pattern(pa.array([text], type=pa.large_string()), "\n").flatten()
+        tbl = pa.table({"password": lines})
     elif path_obj.suffix == ".csv":
-        df = pd.read_csv(path)
-        if 'password' not in df.columns:
+        # Arrow's multithreaded reader; strings stay in Arrow buffers
+        tbl = pv.read_csv(path, convert_options=_CONVERT)
+        if 'password' not in tbl.column_names:
             raise ValueError("CSV must have a 'password' column")
     else:
         raise ValueError("Unsupported file type. Use .txt or .csv")
+    df = tbl.to_pandas(types_mapper=_ARROW_STRINGS.get)
 
-    # Clean passwords
-    df['password'] = df['password'].astype(str).str.strip()
-    df.drop_duplicates(subset=['password'], inplace=True)
-    df = df[df['password'] != '']  # remove empty passwords
+    # Clean passwords; strip/compare/hash all run on Arrow strings, no object column
+    df['password'] = df['password'].astype("string[pyarrow]").str.strip()
+    df = df[df['password'].str.len() > 0]  # remove empty passwords
+    df = df.drop_duplicates(subset=['password'])
     return df
 
 if __name__ == "__main__":
@@ -1,9 +1,95 @@
 # src/policy_engine.py
 import re
-from typing import Dict, Any, Iterable, List, Optional
+import string
+import sys
+from typing import Dict, Any, Iterable, NamedTuple, Optional
 from pathlib import Path
+import numpy as np
 import pandas as pd
 
+# character-class patterns, compiled once and shared by all checks
+_RE_UPPER = re.compile(r"[A-Z]")
+_RE_LOWER = re.compile(r"[a-z]")
+_RE_DIGIT = re.compile(r"\d")
+# consider common printable symbols; this is adjustable
+_RE_SYMBOL = re.compile(r"[!@#$%^&*()\-\_\+=\[\]{};:'\",.<>/?\\|`~]")
+
+# character-class bits produced by the single-pass classifier
+CLASS_LOWER = 1
+CLASS_UPPER = 2
+CLASS_DIGIT = 4
+CLASS_SYMBOL = 8
+# the two bits below are not used by the policy, but let callers (e.g. the
+# simulator's entropy estimate) tell every character apart from the mask alone
+CLASS_OTHER = 16    # neither alphanumeric nor a symbol: space, control chars, ...
+CLASS_NUMERIC = 32  # digit-like but not a decimal digit, e.g. superscripts
+
+# byte -> class bits lookup table; covers ASCII only (the symbol class above is
+# exactly string.punctuation). Non-ASCII passwords fall back to the regexes,
+# since \d is Unicode-aware.
+_CAT = np.zeros(256, dtype=np.uint8)
+_CAT[ord("a"):ord("z") + 1] = CLASS_LOWER
+_CAT[ord("A"):ord("Z") + 1] = CLASS_UPPER
+_CAT[ord("0"):ord("9") + 1] = CLASS_DIGIT
+_CAT[[ord(c) for c in string.punctuation]] = CLASS_SYMBOL
+_CAT[[i for i in range(128) if not chr(i).isalnum() and chr(i) not in string.punctuation]] = CLASS_OTHER
+_CHAR_CAT: Dict[str, int] = {chr(i): int(_CAT[i]) for i in range(128)}
+
+
+def _unicode_mask(pwd: str) -> int:
+    mask = 0
+    if _RE_LOWER.search(pwd):
+        mask |= CLASS_LOWER
+    if _RE_UPPER.search(pwd):
+        mask |= CLASS_UPPER
+    if _RE_DIGIT.search(pwd):
+        mask |= CLASS_DIGIT
+    if _RE_SYMBOL.search(pwd):
+        mask |= CLASS_SYMBOL
+    for c in set(pwd):
+        if not c.isalnum() and c not in string.punctuation:
+            mask |= CLASS_OTHER
+        elif c.isdigit() and not c.isdecimal():
+            mask |= CLASS_NUMERIC
+    return mask
+
+
+def char_class_mask(pwd: str) -> int:
+    """
+    Classify every character of `pwd` in a single pass and return the OR of
+    their CLASS_* bits.
+    """
+    if not pwd.isascii():
+        return _unicode_mask(pwd)
+    mask = 0
+    for c in set(pwd):
+        mask |= _CHAR_CAT[c]
+    return mask
+
+
+def char_class_masks(passwords: Iterable[str]) -> np.ndarray:
+    """
+    Batch version of char_class_mask: all ASCII passwords are packed into one
+    byte buffer, classified with a single table lookup and reduced per row.
+    Returns a uint8 array with one mask per password.
+    """
+    pw = list(passwords)
+    masks = np.zeros(len(pw), dtype=np.uint8)
+    is_ascii = np.fromiter(map(str.isascii, pw), dtype=bool, count=len(pw))
+    rows = np.flatnonzero(is_ascii)
+    packed = pw if rows.size == len(pw) else [pw[i] for i in rows]
+    lengths = np.fromiter(map(len, packed), dtype=np.int64, count=len(packed))
+    buf = np.frombuffer("".join(packed).encode("ascii"), dtype=np.uint8)
+    if buf.size:
+        # empty rows own no bytes, so leaving them out keeps the offsets valid
+        nonempty = lengths > 0
+        starts = (np.cumsum(lengths) - lengths)[nonempty]
+        masks[rows[nonempty]] = np.bitwise_or.reduceat(_CAT[buf], starts)
+    for i in np.flatnonzero(~is_ascii):
+        masks[i] = _unicode_mask(pw[i])
+    return masks
+
+
 DEFAULT_POLICY: Dict[str, Any] = {
     "min_length": 8,
     "require_upper": True,
@@ -15,6 +101,14 @@ DEFAULT_POLICY: Dict[str, Any] = {
 }
 
 
+class Classification(NamedTuple):
+    """Everything the policy and the entropy estimate need, from one classifier pass."""
+    mask: int           # OR of CLASS_* bits over the password's characters
+    length: int
+    policy_ok: bool
+    blacklist_ok: bool
+
+
 class PolicyEngine:
     """
     PolicyEngine checks passwords against a configurable policy.
@@ -37,8 +131,9 @@ class PolicyEngine:
             items = list(bl)
         else:
             items = []
-        # store lowercase forms for case-insensitive blacklist checks
-        self.blacklist = set(x.lower() for x in items)
+        # store interned lowercase forms for case-insensitive blacklist checks;
+        # the set is never mutated after construction
+        self.blacklist = frozenset(sys.intern(x.lower()) for x in items)
 
     def check_password(self, password: str) -> Dict[str, Any]:
         """
@@ -51,41 +146,79 @@ class PolicyEngine:
           - blacklisted: bool (True if NOT blacklisted - i.e. passes blacklist check)
           - policy_ok: bool overall
         """
-        p = self.policy
         pwd = password or ""
-        res: Dict[str, Any] = {}
-        res["password"] = pwd
-        res["length"] = len(pwd)
-        res["min_length"] = res["length"] >= int(p.get("min_length", 0))
-
-        # pattern checks (only enforced if policy asks for them)
-        res["has_upper"] = bool(re.search(r"[A-Z]", pwd))
-        res["has_lower"] = bool(re.search(r"[a-z]", pwd))
-        res["has_digit"] = bool(re.search(r"\d", pwd))
-        # consider common printable symbols; this is adjustable
-        res["has_symbol"] = bool(re.search(r"[!@#$%^&*()\-\_\+=\[\]{};:'\",.<>/?\\|`~]", pwd))
-
-        # blacklist: pass if password (lowercased) is NOT in blacklist
-        res["blacklist_ok"] = (pwd.lower() not in self.blacklist)
-
-        # Apply policy rules (if a rule is not required, treat it as True)
-        ok = True
-        if p.get("require_upper", False) and not res["has_upper"]:
-            ok = False
-        if p.get("require_lower", False) and not res["has_lower"]:
-            ok = False
-        if p.get("require_digit", False) and not res["has_digit"]:
-            ok = False
-        if p.get("require_symbol", False) and not res["has_symbol"]:
-            ok = False
-        if not res["min_length"]:
-            ok = False
-        if not res["blacklist_ok"]:
-            ok = False
-
-        res["policy_ok"] = ok
+        res: Dict[str, Any] = {"password": pwd}
+        res.update(self._checks(char_class_mask(pwd), len(pwd), pwd.lower() not in self.blacklist))
+        res["policy_ok"] = self._apply_rules(res)
         return res
 
+    def classify(self, password: str) -> Classification:
+        """
+        Classify a single password in one pass; callers that also need the
+        character classes (e.g. for entropy) can use `mask` instead of rescanning.
+        """
+        pwd = password or ""
+        mask = char_class_mask(pwd)
+        blacklist_ok = pwd.lower() not in self.blacklist
+        ok = self._apply_rules(self._checks(mask, len(pwd), blacklist_ok))
+        return Classification(mask, len(pwd), bool(ok), blacklist_ok)
+
+    def classify_batch(self, passwords: Iterable[str]) -> pd.DataFrame:
+        """
+        Batch version of classify. Returns a DataFrame with columns
+        ['mask','length','policy_ok','blacklist_ok'], one row per password.
+        """
+        masks, lengths, blacklist_ok = self._classify_series(self._as_series(passwords))
+        ok = self._apply_rules(self._checks(masks, lengths, blacklist_ok))
+        return pd.DataFrame({"mask": masks, "length": lengths, "policy_ok": ok, "blacklist_ok": blacklist_ok})
+
+    @staticmethod
+    def _as_series(passwords: Iterable[str]) -> pd.Series:
+        return pd.Series(list(passwords), dtype="string").fillna("")
+
+    def _classify_series(self, s: pd.Series):
+        # masks, lengths and blacklist results as numpy arrays
+        masks = char_class_masks(s)
+        lengths = s.str.len().to_numpy(dtype=np.int64)
+        blacklist_ok = ~s.str.lower().isin(self.blacklist).to_numpy(dtype=bool)
+        return masks, lengths, blacklist_ok
+
+    def _checks(self, mask, length, blacklist_ok) -> Dict[str, Any]:
+        """
+        Per-rule results derived from the classifier output; works on scalars
+        and on numpy arrays alike.
+        """
+        return {
+            "length": length,
+            "min_length": length >= int(self.policy.get("min_length", 0)),
+            # pattern checks (only enforced if policy asks for them)
+            "has_upper": (mask & CLASS_UPPER) != 0,
+            "has_lower": (mask & CLASS_LOWER) != 0,
+            "has_digit": (mask & CLASS_DIGIT) != 0,
+            "has_symbol": (mask & CLASS_SYMBOL) != 0,
+            # blacklist: pass if password (lowercased) is NOT in blacklist
+            "blacklist_ok": blacklist_ok,
+        }
+
+    def _apply_rules(self, res):
+        """
+        Combine the individual checks into the overall policy result.
+        `res` may hold scalars (single password) or DataFrame columns (batch);
+        rules are combined with `&` so both work the same way.
+        """
+        p = self.policy
+        # a rule that is not required is simply not applied
+        ok = res["min_length"] & res["blacklist_ok"]
+        if p.get("require_upper", False):
+            ok = ok & res["has_upper"]
+        if p.get("require_lower", False):
+            ok = ok & res["has_lower"]
+        if p.get("require_digit", False):
+            ok = ok & res["has_digit"]
+        if p.get("require_symbol", False):
+            ok = ok & res["has_symbol"]
+        return ok
+
     def audit_passwords(self, passwords: Iterable[str]) -> pd.DataFrame:
         """
         Audit an iterable of password strings and return a DataFrame with results.
@@ -93,33 +226,16 @@ class PolicyEngine:
         ['password','length','min_length','has_upper','has_lower','has_digit',
          'has_symbol','blacklist_ok','policy_ok']
         """
-        records: List[Dict[str, Any]] = []
-        for pwd in passwords:
-            records.append(self.check_password(pwd))
-        df = pd.DataFrame.from_records(records)
-        # ensure column order
-        cols = [
-            "password",
-            "length",
-            "min_length",
-            "has_upper",
-            "has_lower",
-            "has_digit",
-            "has_symbol",
-            "blacklist_ok",
-            "policy_ok",
-        ]
-        # add any missing columns (defensive)
-        for c in cols:
-            if c not in df.columns:
-                df[c] = None
-        return df[cols]
+        # work column-at-a-time on the whole Series instead of one dict per row
+        s = self._as_series(passwords)
+        df = pd.DataFrame({"password": s, **self._checks(*self._classify_series(s))})
+        df["policy_ok"] = self._apply_rules(df)
+        return df
 
 
 # CLI for quick testing and demonstration
 if __name__ == "__main__":
     import argparse
-    import sys
 
     parser = argparse.ArgumentParser(description="PolicyEngine quick test / audit")
     parser.add_argument(
@@ -3,25 +3,44 @@
 Phase 3-ready simulator (drop-in replacement for your old simulator.py).
 
 Features:
-- Uses src.policy_engine.PolicyEngine for policy checks (check_password).
+- Uses src.policy_engine.PolicyEngine for policy checks (classify_batch); the same
+  character-class pass also feeds the entropy estimate.
 - Optionally loads a small wordlist from data/rockyou-subset.txt for dictionary checks.
 - Performs a small set of mangling variants (leet, digit suffix/prefix, symbol) for fast dictionary hits.
 - Resilient imports so it runs from project root or inside src/.
-- Produces outputs/results.csv when run as a script.
+- Streams results to outputs/results.parquet when run as a script.
 """
 import math
+from itertools import chain, islice
 from pathlib import Path
-from typing import Iterable, List, Set, Dict
+from typing import Any, Collection, Dict, Iterable, List, Mapping, Set, Union
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from tqdm import tqdm
 
+# optional: prefix-sharing tries keep the wordlist and mangle index compact in memory
+try:
+    import marisa_trie
+except ImportError:
+    marisa_trie = None
+
+# optional: in-memory Bloom filter used to reject unknown passwords cheaply
+try:
+    from pybloomfilter import BloomFilter
+except ImportError:
+    BloomFilter = None
+
 # resilient imports (works from project root or inside src/)
 try:
-    from src.policy_engine import PolicyEngine
-    from src.attacker_models import ALL_PROFILES
+    from src.policy_engine import PolicyEngine, char_class_mask, char_class_masks
+    from src.policy_engine import CLASS_LOWER, CLASS_UPPER, CLASS_DIGIT, CLASS_SYMBOL, CLASS_OTHER, CLASS_NUMERIC
+    from src.attacker_models import ALL_PROFILES, profiles_soa
 except Exception:
-    from policy_engine import PolicyEngine  # type: ignore
-    from attacker_models import ALL_PROFILES  # type: ignore
+    from policy_engine import PolicyEngine, char_class_mask, char_class_masks  # type: ignore
+    from policy_engine import CLASS_LOWER, CLASS_UPPER, CLASS_DIGIT, CLASS_SYMBOL, CLASS_OTHER, CLASS_NUMERIC  # type: ignore
+    from attacker_models import ALL_PROFILES, profiles_soa  # type: ignore
 
 
 # ------------------ Mangling helpers (small, fast) ------------------
@@ -67,30 +86,87 @@ def generate_mangled_set(base: str) -> Set[str]:
 
 
 # ------------------ Entropy & time estimation ------------------
-def estimate_entropy(pwd: str) -> float:
+def _pool_size(mask: int) -> int:
     pool = 0
-    if any("a" <= c <= "z" for c in pwd):
+    if mask & CLASS_LOWER:
         pool += 26
-    if any("A" <= c <= "Z" for c in pwd):
+    if mask & CLASS_UPPER:
         pool += 26
-    if any(c.isdigit() for c in pwd):
+    if mask & (CLASS_DIGIT | CLASS_NUMERIC):
         pool += 10
-    if any(not c.isalnum() for c in pwd):
+    if mask & (CLASS_SYMBOL | CLASS_OTHER):  # anything not alphanumeric
         pool += 32
-    if pool == 0:
-        return 0.0
-    return len(pwd) * math.log2(pool)
+    return pool
+
+
+# log2(pool size) for every possible character-class mask
+_LOG2_POOL = np.array([math.log2(p) if p else 0.0 for p in map(_pool_size, range(64))])
+
+
+def entropy_from_mask(mask, length):
+    """Entropy bits from a character-class mask and length (scalars or arrays)."""
+    return length * _LOG2_POOL[mask]
 
 
-def time_to_bruteforce_seconds(entropy_bits: float, hash_rate: float) -> float:
+def estimate_entropy(pwd: str) -> float:
+    return float(entropy_from_mask(char_class_mask(pwd), len(pwd)))
+
+
+def estimate_entropy_batch(passwords: Iterable[str]) -> np.ndarray:
+    """
+    Vectorized estimate_entropy: classifies all passwords in one packed byte
+    pass and returns a float64 array of entropy bits, one per password.
+    """
+    pw = list(passwords)
+    lengths = np.fromiter(map(len, pw), dtype=np.float64, count=len(pw))
+    return entropy_from_mask(char_class_masks(pw), lengths)
+
+
+def time_to_bruteforce_seconds(entropy_bits: float, hash_rate: float, max_attempts: float = None) -> float:
+    """
+    Average time to brute force `entropy_bits`. The max-attempts cap is checked
+    in log2 space, so passwords the attacker would not reach in `max_attempts`
+    guesses get inf without 2**entropy_bits ever being computed.
+    """
     if hash_rate <= 0:
         return float("inf")
-    attempts = 2 ** entropy_bits
-    avg_attempts = attempts / 2.0
-    return avg_attempts / float(hash_rate)
+    # on average half the keyspace is searched: log2(avg_attempts) = entropy_bits - 1
+    if max_attempts is not None and (max_attempts <= 0 or entropy_bits - 1.0 > math.log2(max_attempts)):
+        return float("inf")
+    if entropy_bits >= 1024:  # 2**entropy_bits beyond float range
+        return float("inf")
+    return 2.0 ** entropy_bits / 2.0 / hash_rate
+
+
+def bruteforce_times(entropy_bits: np.ndarray, hash_rates: np.ndarray, max_attempts: np.ndarray) -> np.ndarray:
+    """
+    Broadcast time_to_bruteforce_seconds over N passwords x A attackers, capped
+    by each attacker's max attempts. Returns an (N, A) float64 array.
+    """
+    bits = np.asarray(entropy_bits, dtype=np.float64)
+    hr = np.asarray(hash_rates, dtype=np.float64)[None, :]
+    # 2**bits through Python's pow, once per entropy value: numpy's exp2/power differ
+    # from it in the last ulp, and time_to_bruteforce_seconds must agree exactly
+    attempts = np.fromiter((2.0 ** b if b < 1024 else math.inf for b in bits.tolist()),
+                           dtype=np.float64, count=bits.size)[:, None]
+    with np.errstate(over="ignore", divide="ignore", invalid="ignore"):
+        log_max = np.log2(np.asarray(max_attempts, dtype=np.float64))[None, :]
+        out_of_reach = (hr <= 0) | (bits[:, None] - 1.0 > log_max)
+        return np.where(out_of_reach, np.inf, attempts / 2.0 / hr)
 
 
 # ------------------ Simulator (Phase 3) ------------------
+# column layout of Simulator.run results (DataFrame or streamed Parquet)
+RESULTS_SCHEMA = pa.schema([
+    ("password", pa.string()),
+    ("policy_ok", pa.bool_()),
+    ("attacker", pa.string()),
+    ("dict_time_sec", pa.float64()),
+    ("bruteforce_time_sec", pa.float64()),
+    ("entropy_bits", pa.float64()),
+])
+
+
 class Simulator:
     def __init__(self, wordlist_path: str = "data/rockyou-subset.txt", mangle_limit: int = 2000):
         """
@@ -100,81 +176,176 @@ class Simulator:
         self.pe = PolicyEngine()
         self.wordlist_path = Path(wordlist_path)
         self.use_wordlist = self.wordlist_path.exists()
-        self.wordlist_set: Set[str] = set()
-        self.mangle_index: Dict[str, str] = {}  # mangled -> base
+        # marisa_trie.Trie when available, otherwise a frozenset; both support `in`
+        self.wordlist_set: Collection[str] = frozenset()
+        # mangled -> base; a marisa_trie.BytesTrie (utf-8 values) when available
+        self.mangle_index: Mapping[str, Any] = {}
+        self._bloom = None  # fast-reject filter over wordlist + mangled keys
         self.mangle_limit = int(mangle_limit)
         if self.use_wordlist:
             self._load_wordlist()
 
+    def _iter_words(self) -> Iterable[str]:
+        """
+        Yield the stripped, non-empty wordlist lines one at a time, so the file
+        never has to exist as a Python list.
+        """
+        with open(self.wordlist_path, "r", encoding="utf-8", errors="ignore") as fh:
+            for w in fh:
+                w = w.strip()
+                if w:
+                    yield w
+
     def _load_wordlist(self):
+        # only the head of the file (the mangling bases) is kept as a list;
+        # the rest streams from the file into the lookup structure
         try:
-            with open(self.wordlist_path, "r", encoding="utf-8", errors="ignore") as fh:
-                words = [w.strip() for w in fh if w.strip()]
+            words = self._iter_words()
+            head = list(islice(words, self.mangle_limit))
+            # store lowercase for case-insensitive checks
+            lowered = (w.lower() for w in chain(head, words))
+            if marisa_trie is not None:
+                self.wordlist_set = marisa_trie.Trie(lowered)
+            else:
+                self.wordlist_set = frozenset(lowered)
         except Exception:
-            words = []
-        words = [w for w in words if w]  # filter empties
-        # store lowercase for case-insensitive checks
-        self.wordlist_set = set(w.lower() for w in words)
-        limit = min(len(words), self.mangle_limit)
-        for base in words[:limit]:
-            for v in generate_mangled_set(base):
-                self.mangle_index[v.lower()] = base.lower()
+            head = []
+            self.wordlist_set = frozenset()
+        # (mangled, base) pairs, streamed straight into the index
+        pairs = (
+            (v, base.lower())
+            for base in head
+            for v in {m.lower() for m in generate_mangled_set(base)}
+        )
+        if marisa_trie is not None:
+            # variants of one base share long prefixes (password1, password12, password!)
+            self.mangle_index = marisa_trie.BytesTrie((v, b.encode("utf-8")) for v, b in pairs)
+        else:
+            self.mangle_index = dict(pairs)
+        if BloomFilter is not None:
+            capacity = max(1, len(self.wordlist_set) + len(self.mangle_index))
+            self._bloom = BloomFilter(capacity, 0.01)
+            self._bloom.update(self.wordlist_set)
+            self._bloom.update(self.mangle_index)
 
     def _is_wordlist_or_mangled(self, pwd: str) -> bool:
         pl = pwd.lower()
-        if pl in self.wordlist_set:
-            return True
-        if pl in self.mangle_index:
-            return True
+        # a Bloom filter miss means definitely not in the wordlist / mangle index;
+        # guard inlined so the no-filter path costs nothing extra
+        bloom = self._bloom
+        if bloom is None or pl in bloom:
+            if pl in self.wordlist_set:
+                return True
+            if pl in self.mangle_index:
+                return True
         # attempt simple reverse-leet to catch common variations
         rev = pl.replace("0", "o").replace("@", "a").replace("1", "i").replace("3", "e").replace("5", "s")
-        if rev in self.wordlist_set:
+        if (bloom is None or rev in bloom) and rev in self.wordlist_set:
             return True
         return False
 
-    def run(self, passwords: Iterable[str], limit: int = None) -> pd.DataFrame:
+    def run(
+        self, passwords: Iterable[str], limit: int = None, chunk_size: int = 10_000, out_path: str = None
+    ) -> Union[pd.DataFrame, Path]:
+        """
+        Simulate every attacker against `passwords`, chunk_size passwords at a time.
+        Returns the results as a DataFrame, or, when `out_path` is given, streams
+        each chunk of output rows to that Parquet file and returns its path. Only
+        the (password x attacker) rows are held per chunk; the password list, the
+        factorized codes/uniques and the per-password features are built in full.
+        """
         pw_list = list(passwords)
         if limit is not None:
             pw_list = pw_list[:limit]
 
-        rows = []
-        for pwd in tqdm(pw_list, desc="Simulating"):
-            pwd = str(pwd)
-            info = self.pe.check_password(pwd)
-            entropy = estimate_entropy(pwd)
-
-            for attacker in ALL_PROFILES:
-                # Dictionary model:
-                dict_hit = False
-                if self.use_wordlist:
-                    # casual attacker uses top-small subset heuristics
-                    if attacker.name.lower() == "casual":
-                        # quick top-N check (cheap): check membership in small slice
-                        top_small = set(list(self.wordlist_set)[:200])
-                        dict_hit = (pwd.lower() in top_small) or self._is_wordlist_or_mangled(pwd)
-                    else:
-                        dict_hit = self._is_wordlist_or_mangled(pwd)
+        pw_list = [str(pwd) for pwd in pw_list]
+        # attacker profiles as arrays, read once per run so later edits to ALL_PROFILES apply
+        profiles = profiles_soa(ALL_PROFILES)
+        # duplicates are simulated once: features are computed for the distinct
+        # passwords only and gathered back per input row through `codes`
+        codes, uniques = pd.factorize(np.array(pw_list, dtype=object))
+        uniques = list(uniques)
+        # vectorized batches of chunk_size; the progress bar advances per chunk
+        parts = []
+        with tqdm(total=len(uniques), desc="Simulating", mininterval=0.5) as bar:
+            for start in range(0, len(uniques), chunk_size):
+                chunk = uniques[start:start + chunk_size]
+                parts.append(self._password_features(chunk, profiles))
+                bar.update(len(chunk))
+        if parts:
+            feats = {k: np.concatenate([part[k] for part in parts]) for k in parts[0]}
+        else:
+            feats = self._password_features([], profiles)
+
+        writer = pq.ParquetWriter(out_path, RESULTS_SCHEMA) if out_path is not None else None
+        frames = []
+        try:
+            for start in range(0, len(pw_list), chunk_size):
+                idx = codes[start:start + chunk_size]
+                chunk_feats = {k: v[idx] for k, v in feats.items()}
+                cols = self._result_columns(pw_list[start:start + chunk_size], chunk_feats, profiles)
+                if writer is not None:
+                    writer.write_batch(pa.record_batch(cols, schema=RESULTS_SCHEMA))
                 else:
-                    # fallback heuristic
-                    dict_hit = (pwd.lower() in ["password", "123456", "qwerty"] or len(pwd) <= 6)
+                    frames.append(pd.DataFrame(cols))
+        finally:
+            if writer is not None:
+                writer.close()
+
+        if writer is not None:
+            return Path(out_path)
+        if not frames:
+            frames.append(pd.DataFrame(self._result_columns([], feats, profiles)))
+        return frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
 
-                t_dict = 1.0 if dict_hit else float("inf")
-                t_bruteforce = time_to_bruteforce_seconds(entropy, attacker.hash_rate)
-                # cap by attacker's max attempts
-                max_seconds = attacker.brute_force_max_attempts / attacker.hash_rate if attacker.hash_rate > 0 else float("inf")
-                if t_bruteforce > max_seconds:
-                    t_bruteforce = float("inf")
+    def _password_features(self, pw_list: List[str], profiles: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Per-password simulation results: policy_ok and entropy_bits of shape (N,),
+        dict_time_sec and bruteforce_time_sec of shape (N, A), one column per attacker.
+        """
+        n, n_att = len(pw_list), profiles.size
+        # per-password features from a single classifier pass, shared by every attacker
+        cls = self.pe.classify_batch(pw_list)
+        policy_ok = cls["policy_ok"].to_numpy(dtype=bool)
+        # entropy (and so brute-force time) depends only on (length, mask): there are
+        # few distinct pairs, so do the arithmetic once per pair and gather back
+        n_masks = _LOG2_POOL.size
+        codes = cls["length"].to_numpy(dtype=np.int64) * n_masks + cls["mask"].to_numpy(dtype=np.int64)
+        uniq, inverse = np.unique(codes, return_inverse=True)
+        uniq_entropies = entropy_from_mask(uniq % n_masks, (uniq // n_masks).astype(np.float64))
+
+        # Dictionary model: the same hit for every attacker. The casual attacker's
+        # top-200 list is the head of the wordlist, so it adds no hits of its own
+        if self.use_wordlist:
+            dict_hit = np.fromiter(map(self._is_wordlist_or_mangled, pw_list), dtype=bool, count=n)
+        else:
+            # fallback heuristic
+            dict_hit = np.fromiter(
+                (pwd.lower() in ["password", "123456", "qwerty"] or len(pwd) <= 6 for pwd in pw_list), dtype=bool, count=n
+            )
 
-                rows.append({
-                    "password": pwd,
-                    "policy_ok": bool(info.get("policy_ok", False)),
-                    "attacker": attacker.name,
-                    "dict_time_sec": t_dict,
-                    "bruteforce_time_sec": t_bruteforce,
-                    "entropy_bits": entropy
-                })
+        t_bruteforce = bruteforce_times(uniq_entropies, profiles["hash_rate"], profiles["max_attempts"])
+        return {
+            "policy_ok": policy_ok,
+            "entropy_bits": uniq_entropies[inverse],
+            "dict_time_sec": np.repeat(np.where(dict_hit, 1.0, np.inf)[:, None], n_att, axis=1),
+            "bruteforce_time_sec": t_bruteforce[inverse],
+        }
 
-        return pd.DataFrame(rows)
+    @staticmethod
+    def _result_columns(
+        pw_list: List[str], feats: Dict[str, np.ndarray], profiles: np.ndarray
+    ) -> Dict[str, np.ndarray]:
+        # result columns: one row per (password, attacker), password-major as before
+        n_att = profiles.size
+        return {
+            "password": np.repeat(np.array(pw_list, dtype=object), n_att),
+            "policy_ok": np.repeat(feats["policy_ok"], n_att),
+            "attacker": np.tile(profiles["name"].astype(object), len(pw_list)),
+            "dict_time_sec": feats["dict_time_sec"].ravel(),
+            "bruteforce_time_sec": feats["bruteforce_time_sec"].ravel(),
+            "entropy_bits": np.repeat(feats["entropy_bits"], n_att),
+        }
 
 
 # ------------------ Script entrypoint ------------------
@@ -196,6 +367,5 @@ if __name__ == "__main__":
         pw_series = pd.read_csv("data/synthetic_passwords.txt", header=None, names=["password"])["password"]
 
     sim = Simulator()
-    df = sim.run(pw_series)
-    df.to_csv("outputs/results.csv", index=False)
-    print("Saved outputs/results.csv — rows:", len(df))
+    out = sim.run(pw_series, out_path="outputs/results.parquet")
+    print(f"Saved {out} — rows:", pq.ParquetFile(out).metadata.num_rows)